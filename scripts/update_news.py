@@ -4,35 +4,88 @@
 from __future__ import annotations
 
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import functools
 import hashlib
-import json
+import heapq
+import io
+import os
 import re
 import time
-import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from html.entities import name2codepoint
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
+import aiohttp
+import orjson
 import requests
 from dateutil import parser as dtparser
+from lxml import etree as ET
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 try:
-    import feedparser
+    import brotli
 except ModuleNotFoundError:
-    feedparser = None
+    brotli = None
 
 UTC = timezone.utc
+MIN_DATETIME = datetime.min.replace(tzinfo=UTC)
 BROWSER_UA = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 )
+# Only advertise br when a decoder is installed; requests and aiohttp both use brotli for it.
+DEFAULT_HEADERS = {
+    "User-Agent": BROWSER_UA,
+    "Accept-Language": "zh-CN,zh;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br" if brotli is not None else "gzip, deflate",
+    "Connection": "keep-alive",
+}
 MOMOYU_RSS_URL = "https://momoyu.cc/api/hot/rss?code=MSw0NywyLDYsOTIsOSwzOCwyOSw0NSw4LDMyLDM2LDExLDgzLDQz"
+OPML_FETCH_CONCURRENCY = 50
+OPML_FETCH_RETRIES = 3
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+MOJIBAKE_RE = re.compile(r"[Ãâåèæïð]|[\x80-\x9f]|æ|ç|å|é")
+TS_LONG_RE = re.compile(r"\d{12,}")
+TS_SHORT_RE = re.compile(r"\d{9,11}")
+RANK_RE = re.compile(r"^(\d+)\.\s*(.*)$")
+NAMED_ZONE_RE = re.compile(r"\s([A-Za-z]{1,5})$")
+UTC_ZONE_NAMES = frozenset(["UT", "UTC", "GMT", "Z"])
+SIMPLE_QUERY_RE = re.compile(r"[\w.~-]+=[\w.~-]*(?:&[\w.~-]+=[\w.~-]*)*", re.ASCII)
+FEED_TITLE_TAGS = frozenset(
+    [
+        "title",
+        "{http://www.w3.org/2005/Atom}title",
+        "{http://purl.org/rss/1.0/}title",
+    ]
+)
+FEED_DATE_TAGS = ("pubDate", "published", "updated", "date")
+XML_AMP_RE = re.compile(rb"<!\[CDATA\[.*?\]\]>|&(#[0-9]+;|#[xX][0-9a-fA-F]+;|[A-Za-z][A-Za-z0-9]*;)?", re.DOTALL)
+XML_ENTITY_DECL_RE = re.compile(rb"<!ENTITY\s+([A-Za-z_][A-Za-z0-9._-]*)")
+XML_PREDEFINED_ENTITIES = frozenset(["amp", "lt", "gt", "quot", "apos"])
+LEGACY_ITEM_ID_LENGTH = 40
+TRACKING_PARAMS = frozenset(
+    [
+        "ref",
+        "spm",
+        "fbclid",
+        "gclid",
+        "igshid",
+        "mkt_tok",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+    ]
+)
+
 
 
 @dataclass
@@ -46,6 +99,14 @@ class RawItem:
     subscription_url: str = ""
 
 
+def env_int(name: str, default: int) -> int:
+    try:
+        value = int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
@@ -56,53 +117,59 @@ def iso(dt: datetime | None) -> str | None:
     return dt.astimezone(UTC).isoformat().replace("+00:00", "Z")
 
 
+@functools.lru_cache(maxsize=65536)
 def parse_iso(dt_str: str | None) -> datetime | None:
     if not dt_str:
         return None
     try:
-        dt = dtparser.parse(dt_str)
-    except Exception:
-        return None
+        # Stored timestamps come from iso(), so the C fromisoformat handles nearly all of them.
+        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = dtparser.parse(dt_str)
+        except Exception:
+            return None
     if not dt.tzinfo:
         dt = dt.replace(tzinfo=UTC)
     return dt.astimezone(UTC)
 
 
+def strip_tracking_query(query: str) -> str:
+    if not query:
+        return query
+    lowered = query.lower()
+    # Plain k=v pairs with no tracker-looking key survive the parse_qsl/urlencode
+    # round trip unchanged, so skip it for the common case.
+    if SIMPLE_QUERY_RE.fullmatch(query) and "utm_" not in lowered:
+        if not any(key in lowered for key in TRACKING_PARAMS):
+            return query
+    kept = []
+    for k, v in parse_qsl(query, keep_blank_values=True):
+        lk = k.lower()
+        if lk.startswith("utm_") or lk in TRACKING_PARAMS:
+            continue
+        kept.append((k, v))
+    return urlencode(kept, doseq=True)
+
+
+@functools.lru_cache(maxsize=65536)
 def normalize_url(raw_url: str) -> str:
     try:
         parsed = urlparse(raw_url.strip())
         if not parsed.scheme:
             return raw_url.strip()
-        query = []
-        for k, v in parse_qsl(parsed.query, keep_blank_values=True):
-            lk = k.lower()
-            if lk.startswith("utm_"):
-                continue
-            if lk in {
-                "ref",
-                "spm",
-                "fbclid",
-                "gclid",
-                "igshid",
-                "mkt_tok",
-                "mc_cid",
-                "mc_eid",
-                "_hsenc",
-                "_hsmi",
-            }:
-                continue
-            query.append((k, v))
         parsed = parsed._replace(
             scheme=parsed.scheme.lower(),
             netloc=parsed.netloc.lower(),
             fragment="",
-            query=urlencode(query, doseq=True),
+            query=strip_tracking_query(parsed.query),
         )
         return urlunparse(parsed).rstrip("/")
     except Exception:
         return raw_url.strip()
 
 
+@functools.lru_cache(maxsize=65536)
 def host_of_url(raw_url: str) -> str:
     try:
         return urlparse(raw_url).netloc.lower()
@@ -152,71 +219,191 @@ def parse_date_any(value: Any, now: datetime) -> datetime | None:
     if s.startswith("$D"):
         s = s[2:]
 
-    if re.fullmatch(r"\d{12,}", s):
+    if TS_LONG_RE.fullmatch(s):
         return parse_unix_timestamp(int(s))
-    if re.fullmatch(r"\d{9,11}", s):
+    if TS_SHORT_RE.fullmatch(s):
         return parse_unix_timestamp(int(s))
 
+    # Feeds almost always use ISO 8601 or RFC 822; only hand other shapes to dateutil.
     try:
-        dt = dtparser.parse(s, tzinfos={"UT": 0, "UTC": 0, "GMT": 0})
-        if not dt.tzinfo:
-            dt = dt.replace(tzinfo=UTC)
-        return dt.astimezone(UTC)
-    except Exception:
-        return None
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        dt = None
+        # email.utils reads zone names like CST as US zones; for anything but UTC
+        # aliases keep dateutil's behavior so e.g. China Standard Time is not shifted.
+        zone = NAMED_ZONE_RE.search(s)
+        if zone is None or zone.group(1).upper() in UTC_ZONE_NAMES:
+            try:
+                dt = parsedate_to_datetime(s)
+            except (TypeError, ValueError, IndexError):
+                dt = None
+        if dt is None:
+            try:
+                dt = dtparser.parse(s, tzinfos={"UT": 0, "UTC": 0, "GMT": 0})
+            except Exception:
+                return None
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
 
 
-def parse_feed_entries_via_xml(feed_xml: bytes) -> list[dict[str, Any]]:
+def xml_parser() -> ET.XMLParser:
+    # lxml parsers must not be shared across threads, so build one per parse.
+    # lxml resolves internal DTD entities only; external/SYSTEM entities are refused.
+    return ET.XMLParser(no_network=True)
+
+
+def read_feed_entry(node: Any) -> tuple[str, str, str | None]:
+    title = None
+    fallback_title = None
+    link = ""
+    fallback_link = ""
+    dates: dict[str, str] = {}
+
+    # One pass over the entry's children instead of a find() per candidate tag.
+    for child in node:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue
+        local = tag.rsplit("}", 1)[-1]
+        if local == "title":
+            # Extension titles such as <media:title> only count when the entry has no real one.
+            if tag in FEED_TITLE_TAGS:
+                if title is None:
+                    title = child.text or ""
+            elif fallback_title is None:
+                fallback_title = child.text or ""
+        elif local == "link":
+            if link:
+                continue
+            href = (child.get("href") or child.text or "").strip()
+            if not href:
+                continue
+            if child.get("rel") in (None, "alternate"):
+                link = href
+            elif not fallback_link:
+                fallback_link = href
+        elif local in FEED_DATE_TAGS:
+            dates.setdefault(local, child.text or "")
+
+    published = next((dates[t] for t in FEED_DATE_TAGS if dates.get(t)), None)
+    if title is None:
+        title = fallback_title
+    return (title or "").strip(), link or fallback_link, published
+
+
+def repair_feed_xml(feed_xml: bytes) -> bytes:
+    declared = {m.decode("ascii") for m in XML_ENTITY_DECL_RE.findall(feed_xml)}
+
+    def fix(match: re.Match[bytes]) -> bytes:
+        ref = match.group(1)
+        # CDATA sections and numeric references are already valid XML.
+        if match.group(0).startswith(b"<!") or (ref and ref.startswith(b"#")):
+            return match.group(0)
+        if ref is None:
+            return b"&amp;"
+        name = ref[:-1].decode("ascii")
+        if name in XML_PREDEFINED_ENTITIES or name in declared:
+            return match.group(0)
+        codepoint = name2codepoint.get(name)
+        if codepoint is None:
+            return b"&amp;" + ref
+        return b"&#%d;" % codepoint
+
+    return XML_AMP_RE.sub(fix, feed_xml)
+
+
+def parse_feed_via_xml(feed_xml: bytes) -> tuple[str, list[dict[str, Any]]]:
+    try:
+        return _parse_feed_xml(feed_xml, recover=False)
+    except ET.XMLSyntaxError:
+        # libxml2's recovery silently drops bare "&" and HTML-only entities, so repair those first.
+        return _parse_feed_xml(repair_feed_xml(feed_xml), recover=True)
+
+
+def _parse_feed_xml(feed_xml: bytes, recover: bool) -> tuple[str, list[dict[str, Any]]]:
+    feed_title = None
     out: list[dict[str, Any]] = []
     seen: set[tuple[str, str]] = set()
+    events = ET.iterparse(
+        io.BytesIO(feed_xml),
+        events=("end",),
+        tag=("{*}item", "{*}entry"),
+        recover=recover,
+        no_network=True,
+    )
+
     try:
-        root = ET.fromstring(feed_xml)
-    except Exception:
-        return out
+        for _, node in events:
+            parent = node.getparent()
+            if feed_title is None and parent is not None:
+                # Channel metadata precedes the entries, so read it before siblings are dropped.
+                feed_title = (
+                    parent.findtext("{*}title") or parent.findtext("{*}channel/{*}title") or ""
+                ).strip()
+
+            title, link, published = read_feed_entry(node)
+
+            # Drop the parsed entry and any earlier siblings so memory stays flat.
+            node.clear()
+            if parent is not None:
+                while node.getprevious() is not None:
+                    del parent[0]
 
-    for tag in (".//item", ".//{*}item", ".//entry", ".//{*}entry"):
-        for node in root.findall(tag):
-            title = (node.findtext("title") or node.findtext("{*}title") or "").strip()
-            link = ""
-            link_node = node.find("link")
-            if link_node is not None:
-                link = (link_node.get("href") or link_node.text or "").strip()
-            if not link:
-                link = (node.findtext("{*}link") or node.findtext("link") or "").strip()
-            published = (
-                node.findtext("pubDate")
-                or node.findtext("{*}pubDate")
-                or node.findtext("published")
-                or node.findtext("{*}published")
-                or node.findtext("updated")
-                or node.findtext("{*}updated")
-            )
             if title and link:
                 key = (title, link)
                 if key in seen:
                     continue
                 seen.add(key)
                 out.append({"title": title, "link": link, "published": published})
-    return out
+    except ET.XMLSyntaxError:
+        if not recover:
+            raise
+        # Keep whatever entries were read before the document became unparseable.
+    return feed_title or "", out
+
+
+def parse_feed_entries_via_xml(feed_xml: bytes) -> list[dict[str, Any]]:
+    return parse_feed_via_xml(feed_xml)[1]
 
 
-def make_item_id(site_id: str, source: str, title: str, url: str) -> str:
+@functools.lru_cache(maxsize=65536)
+def make_item_id(
+    site_id: str,
+    source: str,
+    title: str,
+    url: str,
+    already_normalized: bool = False,
+) -> str:
     key = "||".join(
         [
             site_id.strip().lower(),
             source.strip().lower(),
             title.strip().lower(),
-            normalize_url(url),
+            url if already_normalized else normalize_url(url),
         ]
     )
-    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def migrate_item_id(item_id: str, record: dict[str, Any]) -> str:
+    # Archives written before the BLAKE2b switch keyed records by 40-char SHA-1 ids.
+    if len(item_id) != LEGACY_ITEM_ID_LENGTH:
+        return item_id
+    return make_item_id(
+        str(record.get("site_id") or ""),
+        str(record.get("source") or ""),
+        str(record.get("title") or ""),
+        str(record.get("url") or ""),
+    )
 
 
+@functools.lru_cache(maxsize=65536)
 def maybe_fix_mojibake(text: str) -> str:
     s = (text or "").strip()
     if not s:
         return s
-    if re.search(r"[Ãâåèæïð]|[\x80-\x9f]|æ|ç|å|é", s) is None:
+    if MOJIBAKE_RE.search(s) is None:
         return s
     for enc in ("latin1", "cp1252"):
         try:
@@ -251,12 +438,12 @@ def create_session() -> requests.Session:
     adapter = HTTPAdapter(max_retries=retry)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
-    session.headers.update({"User-Agent": BROWSER_UA, "Accept-Language": "zh-CN,zh;q=0.9"})
+    session.headers.update(DEFAULT_HEADERS)
     return session
 
 
 def parse_opml_subscriptions(opml_path: Path) -> list[dict[str, str]]:
-    root = ET.parse(opml_path).getroot()
+    root = ET.parse(str(opml_path), xml_parser()).getroot()
     out: list[dict[str, str]] = []
     seen: set[str] = set()
 
@@ -278,8 +465,8 @@ def parse_opml_subscriptions(opml_path: Path) -> list[dict[str, str]]:
     return out
 
 
-def fetch_rss_feed(
-    session: requests.Session,
+def parse_feed_items(
+    content: bytes,
     now: datetime,
     feed_url: str,
     site_id: str,
@@ -287,82 +474,129 @@ def fetch_rss_feed(
     feed_title: str,
     allow_missing_published: bool = False,
     subscription_url: str = "",
-) -> tuple[list[RawItem], dict[str, Any]]:
-    start = time.perf_counter()
+) -> list[RawItem]:
     out: list[RawItem] = []
-    error = None
+    channel_title, entries = parse_feed_via_xml(content)
+    source_name = first_non_empty(feed_title, channel_title, host_of_url(feed_url))
+    for entry in entries:
+        published = parse_date_any(entry.get("published"), now)
+        if not published and allow_missing_published:
+            published = now
+        if not published:
+            continue
+        out.append(
+            RawItem(
+                site_id=site_id,
+                site_name=site_name,
+                source=source_name,
+                title=entry["title"],
+                url=entry["link"],
+                published_at=published,
+                subscription_url=subscription_url,
+            )
+        )
+    return out
 
+
+def load_feed_validators(path: Path) -> dict[str, dict[str, str]]:
+    if not path.exists():
+        return {}
     try:
-        resp = session.get(feed_url, timeout=12)
-        resp.raise_for_status()
+        payload = orjson.loads(path.read_bytes())
+    except Exception:
+        return {}
+
+    statuses = list(payload.get("sites") or []) + list((payload.get("rss_opml") or {}).get("feeds") or [])
+    out: dict[str, dict[str, str]] = {}
+    for status in statuses:
+        if not isinstance(status, dict) or not status.get("ok"):
+            continue
+        feed_url = str(status.get("feed_url") or "")
+        validators = {k: str(status[k]) for k in ("etag", "last_modified") if status.get(k)}
+        if feed_url and validators:
+            out[feed_url] = validators
+    return out
+
+
+def conditional_headers(validators: dict[str, str] | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if not validators:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
 
-        if feedparser is not None:
-            parsed = feedparser.parse(resp.content)
-            source_name = first_non_empty(
-                feed_title,
-                getattr(parsed, "feed", {}).get("title"),
-                host_of_url(feed_url),
-            )
-            entries = parsed.entries
-            for entry in entries:
-                title = str(entry.get("title", "")).strip()
-                link = str(entry.get("link", "")).strip()
-                if not title or not link:
-                    continue
-                published = (
-                    parse_date_any(entry.get("published"), now)
-                    or parse_date_any(entry.get("updated"), now)
-                    or parse_date_any(entry.get("pubDate"), now)
-                )
-                if not published and allow_missing_published:
-                    published = now
-                if not published:
-                    continue
-                out.append(
-                    RawItem(
-                        site_id=site_id,
-                        site_name=site_name,
-                        source=source_name,
-                        title=title,
-                        url=link,
-                        published_at=published,
-                        subscription_url=subscription_url,
-                    )
-                )
-        else:
-            source_name = first_non_empty(feed_title, host_of_url(feed_url))
-            entries = parse_feed_entries_via_xml(resp.content)
-            for entry in entries:
-                published = parse_date_any(entry.get("published"), now)
-                if not published and allow_missing_published:
-                    published = now
-                if not published:
-                    continue
-                out.append(
-                    RawItem(
-                        site_id=site_id,
-                        site_name=site_name,
-                        source=source_name,
-                        title=entry.get("title", ""),
-                        url=entry.get("link", ""),
-                        published_at=published,
-                        subscription_url=subscription_url,
-                    )
-                )
-    except Exception as exc:
-        error = str(exc)
 
+def feed_status(
+    site_id: str,
+    site_name: str,
+    feed_url: str,
+    items: list[RawItem],
+    start: float,
+    error: str | None,
+    validators: dict[str, str | None] | None = None,
+    unchanged: bool = False,
+) -> dict[str, Any]:
     duration_ms = int((time.perf_counter() - start) * 1000)
-    status = {
+    validators = validators or {}
+    return {
         "site_id": site_id,
         "site_name": site_name,
         "ok": error is None,
-        "item_count": len(out),
+        "item_count": len(items),
         "duration_ms": duration_ms,
         "error": error,
         "feed_url": feed_url,
+        "etag": validators.get("etag"),
+        "last_modified": validators.get("last_modified"),
+        "unchanged": unchanged,
     }
-    return out, status
+
+
+def fetch_rss_feed(
+    session: requests.Session,
+    now: datetime,
+    feed_url: str,
+    site_id: str,
+    site_name: str,
+    feed_title: str,
+    allow_missing_published: bool = False,
+    subscription_url: str = "",
+    validators: dict[str, str] | None = None,
+) -> tuple[list[RawItem], dict[str, Any], bytes | None]:
+    start = time.perf_counter()
+    out: list[RawItem] = []
+    content = None
+    error = None
+    fetched: dict[str, str | None] = {}
+    unchanged = False
+
+    try:
+        resp = session.get(feed_url, timeout=12, headers=conditional_headers(validators))
+        if resp.status_code == 304:
+            # Nothing new since the last run; keep the validators for the next one.
+            fetched = dict(validators or {})
+            unchanged = True
+            return out, feed_status(site_id, site_name, feed_url, out, start, error, fetched, unchanged), content
+        resp.raise_for_status()
+        fetched = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+        content = resp.content
+        out = parse_feed_items(
+            content,
+            now,
+            feed_url=feed_url,
+            site_id=site_id,
+            site_name=site_name,
+            feed_title=feed_title,
+            allow_missing_published=allow_missing_published,
+            subscription_url=subscription_url,
+        )
+    except Exception as exc:
+        error = str(exc)
+
+    return out, feed_status(site_id, site_name, feed_url, out, start, error, fetched, unchanged), content
 
 
 def parse_momoyu_description_sections(description_html: str) -> list[dict[str, Any]]:
@@ -370,29 +604,29 @@ def parse_momoyu_description_sections(description_html: str) -> list[dict[str, A
     if not html:
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
     sections: list[dict[str, Any]] = []
 
     for h2 in soup.find_all("h2"):
         section_name = h2.get_text(" ", strip=True)
         entries: list[dict[str, Any]] = []
 
-        cursor = h2.next_sibling
-        while cursor is not None:
-            tag_name = getattr(cursor, "name", None)
-            if tag_name == "h2":
+        for sibling in h2.next_siblings:
+            if not isinstance(sibling, Tag):
+                continue
+            if sibling.name == "h2":
                 break
-            if tag_name == "p":
-                a = cursor.find("a")
-                text = cursor.get_text(" ", strip=True)
-                url = (a.get("href") or "").strip() if a else ""
-                rank = None
-                m = re.match(r"^(\d+)\.\s*(.*)$", text)
-                if m:
-                    rank = int(m.group(1))
-                    text = m.group(2).strip()
-                entries.append({"rank": rank, "title": text, "url": url})
-            cursor = cursor.next_sibling
+            if sibling.name != "p":
+                continue
+            a = sibling.find("a")
+            text = sibling.get_text(" ", strip=True)
+            url = (a.get("href") or "").strip() if a else ""
+            rank = None
+            m = RANK_RE.match(text)
+            if m:
+                rank = int(m.group(1))
+                text = m.group(2).strip()
+            entries.append({"rank": rank, "title": text, "url": url})
 
         sections.append(
             {
@@ -405,17 +639,19 @@ def parse_momoyu_description_sections(description_html: str) -> list[dict[str, A
     return sections
 
 
-def fetch_momoyu_structured(session: requests.Session, feed_url: str) -> dict[str, Any]:
-    out: dict[str, Any] = {
+def empty_momoyu_structured() -> dict[str, Any]:
+    return {
         "item_title": None,
         "pubDate": None,
         "section_count": 0,
         "sections": [],
     }
+
+
+def parse_momoyu_structured(feed_xml: bytes) -> dict[str, Any]:
+    out = empty_momoyu_structured()
     try:
-        resp = session.get(feed_url, timeout=12)
-        resp.raise_for_status()
-        root = ET.fromstring(resp.content)
+        root = ET.fromstring(feed_xml, xml_parser())
         item = root.find("./channel/item")
         if item is None:
             return out
@@ -433,11 +669,88 @@ def fetch_momoyu_structured(session: requests.Session, feed_url: str) -> dict[st
         return out
 
 
-def fetch_opml_rss(
-    session: requests.Session,
+def load_previous_momoyu_structured(latest_path: Path) -> dict[str, Any]:
+    try:
+        parsed = orjson.loads(latest_path.read_bytes()).get("momoyu_parsed")
+    except Exception:
+        parsed = None
+    return parsed if isinstance(parsed, dict) else empty_momoyu_structured()
+
+
+def opml_feed_status(
+    feed: dict[str, str],
+    items: list[RawItem],
+    start: float,
+    error: str | None,
+    validators: dict[str, str | None] | None = None,
+    unchanged: bool = False,
+) -> dict[str, Any]:
+    feed_url = feed["xml_url"]
+    status = feed_status("opmlrss", "OPML RSS", feed_url, items, start, error, validators, unchanged)
+    status["feed_title"] = feed["title"]
+    status["effective_feed_url"] = feed_url
+    status["skipped"] = False
+    status["replaced"] = False
+    return status
+
+
+async def _fetch_one(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    feed: dict[str, str],
+    now: datetime,
+    validators: dict[str, str] | None = None,
+) -> tuple[list[RawItem], dict[str, Any]]:
+    feed_url = feed["xml_url"]
+    start = time.perf_counter()
+    out: list[RawItem] = []
+    error = None
+    fetched: dict[str, str | None] = {}
+    headers = conditional_headers(validators)
+
+    try:
+        for attempt in range(OPML_FETCH_RETRIES + 1):
+            try:
+                async with sem, session.get(
+                    feed_url,
+                    timeout=aiohttp.ClientTimeout(total=12),
+                    headers=headers,
+                ) as resp:
+                    if resp.status == 304:
+                        # Nothing new since the last run; keep the validators for the next one.
+                        return out, opml_feed_status(feed, out, start, error, dict(validators or {}), True)
+                    resp.raise_for_status()
+                    content = await resp.read()
+                    fetched = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                retryable = not isinstance(exc, aiohttp.ClientResponseError) or exc.status in RETRY_STATUSES
+                if not retryable or attempt >= OPML_FETCH_RETRIES:
+                    raise
+                await asyncio.sleep(0.8 * (2**attempt))
+        # Parsing is CPU-bound; keep it off the event loop.
+        out = await asyncio.to_thread(
+            parse_feed_items,
+            content,
+            now,
+            feed_url=feed_url,
+            site_id="opmlrss",
+            site_name="OPML RSS",
+            feed_title=feed["title"],
+            subscription_url=feed_url,
+        )
+    except Exception as exc:
+        error = str(exc) or exc.__class__.__name__
+
+    return out, opml_feed_status(feed, out, start, error, fetched)
+
+
+async def fetch_opml_rss_async(
     now: datetime,
     opml_path: Path,
     max_feeds: int = 0,
+    concurrency: int = OPML_FETCH_CONCURRENCY,
+    validators: dict[str, dict[str, str]] | None = None,
 ) -> tuple[list[RawItem], dict[str, Any], list[dict[str, Any]]]:
     feeds = parse_opml_subscriptions(opml_path)
     if max_feeds > 0:
@@ -446,36 +759,28 @@ def fetch_opml_rss(
     out: list[RawItem] = []
     feed_statuses: list[dict[str, Any]] = []
 
-    def fetch_one(feed: dict[str, str]) -> tuple[list[RawItem], dict[str, Any]]:
-        feed_url = feed["xml_url"]
-        items, status = fetch_rss_feed(
-            session=session,
-            now=now,
-            feed_url=feed_url,
-            site_id="opmlrss",
-            site_name="OPML RSS",
-            feed_title=feed["title"],
-            subscription_url=feed_url,
-        )
-        status["feed_title"] = feed["title"]
-        status["effective_feed_url"] = feed_url
-        status["skipped"] = False
-        status["replaced"] = False
-        return items, status
-
     if feeds:
-        workers = min(20, max(4, len(feeds)))
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = [executor.submit(fetch_one, f) for f in feeds]
-            for future in as_completed(futures):
-                items, status = future.result()
-                out.extend(items)
-                feed_statuses.append(status)
+        # Size the connection pool to the semaphore so admitted fetches never queue for a socket.
+        sem = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, connector=connector) as session:
+            results = await asyncio.gather(
+                *[_fetch_one(session, sem, f, now, (validators or {}).get(f["xml_url"])) for f in feeds],
+                return_exceptions=True,
+            )
+        for feed, result in zip(feeds, results):
+            if isinstance(result, BaseException):
+                feed_statuses.append(opml_feed_status(feed, [], time.perf_counter(), str(result)))
+                continue
+            items, status = result
+            out.extend(items)
+            feed_statuses.append(status)
 
     feed_statuses.sort(key=lambda x: str(x.get("feed_title") or x.get("feed_url") or ""))
     total_duration_ms = sum(int(s.get("duration_ms") or 0) for s in feed_statuses)
     ok_feeds = sum(1 for s in feed_statuses if s["ok"])
     failed_feeds = sum(1 for s in feed_statuses if not s["ok"])
+    unchanged_feeds = sum(1 for s in feed_statuses if s.get("unchanged"))
 
     summary_status = {
         "site_id": "opmlrss",
@@ -489,6 +794,9 @@ def fetch_opml_rss(
         "effective_feed_count": len(feeds),
         "ok_feed_count": ok_feeds,
         "failed_feed_count": failed_feeds,
+        "unchanged_feed_count": unchanged_feeds,
+        # Every feed that answered was a 304, so 0 items is expected rather than an alert.
+        "unchanged": ok_feeds > 0 and unchanged_feeds == ok_feeds,
         "skipped_feed_count": 0,
         "replaced_feed_count": 0,
     }
@@ -500,7 +808,7 @@ def load_archive(path: Path) -> dict[str, dict[str, Any]]:
     if not path.exists():
         return {}
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = orjson.loads(path.read_bytes())
     except Exception:
         return {}
 
@@ -510,15 +818,25 @@ def load_archive(path: Path) -> dict[str, dict[str, Any]]:
         for it in items:
             item_id = it.get("id")
             if item_id:
-                out[item_id] = it
+                item_id = migrate_item_id(item_id, it)
+                it["id"] = item_id
+                out.setdefault(item_id, it)
     elif isinstance(items, dict):
         for item_id, it in items.items():
             if isinstance(it, dict):
+                item_id = migrate_item_id(item_id, it)
                 it["id"] = item_id
-                out[item_id] = it
+                out.setdefault(item_id, it)
     return out
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Readers see either the old file or the new one, never a partial write.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def event_time(record: dict[str, Any]) -> datetime | None:
     return parse_iso(record.get("published_at")) or parse_iso(record.get("first_seen_at"))
 
@@ -586,7 +904,7 @@ def group_follow_opml_items(
     for group in grouped.values():
         all_items = sorted(
             group["items"],
-            key=lambda x: event_time(x) or datetime.min.replace(tzinfo=UTC),
+            key=lambda x: event_time(x) or MIN_DATETIME,
             reverse=True,
         )
         shown = all_items[:per_feed_limit]
@@ -603,7 +921,7 @@ def group_follow_opml_items(
 
     out.sort(
         key=lambda group: (
-            event_time(group["items"][0]) if group["items"] else datetime.min.replace(tzinfo=UTC),
+            event_time(group["items"][0]) if group["items"] else MIN_DATETIME,
             group["source"],
         ),
         reverse=True,
@@ -618,6 +936,12 @@ def main() -> int:
     parser.add_argument("--archive-days", type=int, default=7, help="Keep archive for N days")
     parser.add_argument("--rss-opml", default="", help="Optional OPML file path to include RSS sources")
     parser.add_argument("--rss-max-feeds", type=int, default=0, help="Optional max OPML RSS feeds to fetch (0 means all)")
+    parser.add_argument(
+        "--rss-workers",
+        type=int,
+        default=env_int("AI_NEWS_WORKERS", OPML_FETCH_CONCURRENCY),
+        help="Max concurrent OPML RSS fetches (defaults to $AI_NEWS_WORKERS or 50)",
+    )
     args = parser.parse_args()
 
     now = utc_now()
@@ -630,6 +954,8 @@ def main() -> int:
     title_cache_path = output_dir / "title-zh-cache.json"
 
     archive = load_archive(archive_path)
+    # Without an archive there is nothing to fall back on when a feed answers 304.
+    validators = load_feed_validators(status_path) if archive else {}
     session = create_session()
 
     raw_items: list[RawItem] = []
@@ -639,11 +965,14 @@ def main() -> int:
     if args.rss_opml:
         opml_path = Path(args.rss_opml).expanduser()
         if opml_path.exists():
-            opml_items, opml_summary, rss_feed_statuses = fetch_opml_rss(
-                session=session,
-                now=now,
-                opml_path=opml_path,
-                max_feeds=max(0, int(args.rss_max_feeds)),
+            opml_items, opml_summary, rss_feed_statuses = asyncio.run(
+                fetch_opml_rss_async(
+                    now=now,
+                    opml_path=opml_path,
+                    max_feeds=max(0, int(args.rss_max_feeds)),
+                    concurrency=max(1, int(args.rss_workers)),
+                    validators=validators,
+                )
             )
             raw_items.extend(opml_items)
             statuses.append(opml_summary)
@@ -662,7 +991,7 @@ def main() -> int:
                 }
             )
 
-    momoyu_items, momoyu_status = fetch_rss_feed(
+    momoyu_items, momoyu_status, momoyu_content = fetch_rss_feed(
         session=session,
         now=now,
         feed_url=MOMOYU_RSS_URL,
@@ -671,17 +1000,44 @@ def main() -> int:
         feed_title="momoyu.cc",
         allow_missing_published=True,
         subscription_url=MOMOYU_RSS_URL,
+        validators=validators.get(MOMOYU_RSS_URL),
     )
     raw_items.extend(momoyu_items)
     statuses.append(momoyu_status)
-    momoyu_parsed = fetch_momoyu_structured(session, MOMOYU_RSS_URL)
+    # The structured view comes from the same response; a 304 keeps last run's copy.
+    if momoyu_content is not None:
+        momoyu_parsed = parse_momoyu_structured(momoyu_content)
+    elif momoyu_status["unchanged"]:
+        momoyu_parsed = load_previous_momoyu_structured(latest_path)
+    else:
+        momoyu_parsed = empty_momoyu_structured()
+
+    now_iso = iso(now)
+    unchanged_urls = {s.get("feed_url") for s in [*statuses, *rss_feed_statuses] if s.get("unchanged")}
+    if unchanged_urls:
+        # A 304 means the feed still serves what its last 200 served; those records
+        # share that feed's newest last_seen_at, so only they are kept from aging out.
+        unchanged_records: dict[str, list[tuple[datetime, dict[str, Any]]]] = {}
+        for record in archive.values():
+            sub_url = record.get("subscription_url")
+            if sub_url in unchanged_urls:
+                seen = parse_iso(record.get("last_seen_at")) or MIN_DATETIME
+                unchanged_records.setdefault(sub_url, []).append((seen, record))
+        for records in unchanged_records.values():
+            newest = max(seen for seen, _ in records)
+            for seen, record in records:
+                if seen == newest:
+                    record["last_seen_at"] = now_iso
 
     for raw in raw_items:
         title = raw.title.strip()
+        if not title:
+            continue
         url = normalize_url(raw.url)
-        if not title or not url or not url.startswith("http"):
+        if not url.startswith("http"):
             continue
-        item_id = make_item_id(raw.site_id, raw.source, title, url)
+        item_id = make_item_id(raw.site_id, raw.source, title, url, already_normalized=True)
+        published_iso = iso(raw.published_at)
 
         existing = archive.get(item_id)
         if existing is None:
@@ -693,9 +1049,9 @@ def main() -> int:
                 "subscription_url": raw.subscription_url,
                 "title": title,
                 "url": url,
-                "published_at": iso(raw.published_at),
-                "first_seen_at": iso(now),
-                "last_seen_at": iso(now),
+                "published_at": published_iso,
+                "first_seen_at": now_iso,
+                "last_seen_at": now_iso,
             }
         else:
             existing["site_id"] = raw.site_id
@@ -703,13 +1059,17 @@ def main() -> int:
             existing["source"] = raw.source
             existing["title"] = title
             existing["url"] = url
-            if raw.published_at:
-                existing["published_at"] = iso(raw.published_at)
-            existing["last_seen_at"] = iso(now)
+            if published_iso:
+                existing["published_at"] = published_iso
+            existing["last_seen_at"] = now_iso
             existing["subscription_url"] = raw.subscription_url or str(existing.get("subscription_url") or "")
 
     keep_after = now - timedelta(days=args.archive_days)
     pruned: dict[str, dict[str, Any]] = {}
+    follow_items: list[dict[str, Any]] = []
+    momoyu_items_out: list[dict[str, Any]] = []
+
+    # Prune and split by section in one pass over the archive.
     for item_id, record in archive.items():
         ts = (
             parse_iso(record.get("last_seen_at"))
@@ -717,38 +1077,35 @@ def main() -> int:
             or parse_iso(record.get("first_seen_at"))
             or now
         )
-        if ts >= keep_after:
-            pruned[item_id] = record
-    archive = pruned
-
-    follow_items: list[dict[str, Any]] = []
-    momoyu_items_out: list[dict[str, Any]] = []
-
-    for record in archive.values():
-        sid = str(record.get("site_id") or "")
-        if sid not in {"opmlrss", "momoyurss"}:
+        if ts < keep_after:
             continue
-        normalized = enrich_record(record)
+        pruned[item_id] = record
+
+        sid = record.get("site_id")
         if sid == "opmlrss":
-            follow_items.append(normalized)
+            follow_items.append(enrich_record(record))
         elif sid == "momoyurss":
-            momoyu_items_out.append(normalized)
+            momoyu_items_out.append(enrich_record(record))
+    archive = pruned
 
-    follow_items.sort(key=lambda x: event_time(x) or datetime.min.replace(tzinfo=UTC), reverse=True)
-    momoyu_items_out.sort(key=lambda x: event_time(x) or datetime.min.replace(tzinfo=UTC), reverse=True)
+    # group_follow_opml_items orders each feed itself, so only momoyu needs a top-N pick.
     follow_groups = group_follow_opml_items(follow_items, per_feed_limit=10)
     follow_items = [item for group in follow_groups for item in group["items"]]
-    momoyu_items_out = momoyu_items_out[:20]
+    momoyu_items_out = heapq.nlargest(
+        20,
+        momoyu_items_out,
+        key=lambda x: event_time(x) or MIN_DATETIME,
+    )
 
     subscription_items = sorted(
         follow_items + momoyu_items_out,
-        key=lambda x: event_time(x) or datetime.min.replace(tzinfo=UTC),
+        key=lambda x: event_time(x) or MIN_DATETIME,
         reverse=True,
     )
     site_stats, source_count = group_stats(subscription_items)
 
     latest_payload = {
-        "generated_at": iso(now),
+        "generated_at": now_iso,
         "window_hours": args.window_hours,
         "archive_total": len(archive),
         "site_count": len(site_stats),
@@ -792,22 +1149,24 @@ def main() -> int:
     }
 
     archive_payload = {
-        "generated_at": iso(now),
+        "generated_at": now_iso,
         "total_items": len(archive),
         "items": sorted(
             archive.values(),
-            key=lambda x: parse_iso(x.get("last_seen_at")) or datetime.min.replace(tzinfo=UTC),
+            key=lambda x: parse_iso(x.get("last_seen_at")) or MIN_DATETIME,
             reverse=True,
         ),
     }
 
     status_payload = {
-        "generated_at": iso(now),
+        "generated_at": now_iso,
         "sites": statuses,
         "successful_sites": sum(1 for s in statuses if s.get("ok")),
         "failed_sites": [s.get("site_id") for s in statuses if not s.get("ok")],
         "zero_item_sites": [
-            s.get("site_id") for s in statuses if s.get("ok") and int(s.get("item_count") or 0) == 0
+            s.get("site_id")
+            for s in statuses
+            if s.get("ok") and not s.get("unchanged") and int(s.get("item_count") or 0) == 0
         ],
         "fetched_raw_items": len(raw_items),
         "items_before_filter": len(subscription_items),
@@ -822,7 +1181,10 @@ def main() -> int:
             "zero_item_feeds": [
                 s.get("effective_feed_url") or s.get("feed_url")
                 for s in rss_feed_statuses
-                if s.get("ok") and int(s.get("item_count") or 0) == 0
+                if s.get("ok") and not s.get("unchanged") and int(s.get("item_count") or 0) == 0
+            ],
+            "unchanged_feeds": [
+                s.get("effective_feed_url") or s.get("feed_url") for s in rss_feed_statuses if s.get("unchanged")
             ],
             "skipped_feeds": [],
             "replaced_feeds": [],
@@ -830,10 +1192,10 @@ def main() -> int:
         },
     }
 
-    latest_path.write_text(json.dumps(latest_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    archive_path.write_text(json.dumps(archive_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    status_path.write_text(json.dumps(status_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    title_cache_path.write_text(json.dumps({}, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_bytes(latest_path, orjson.dumps(latest_payload, option=orjson.OPT_INDENT_2))
+    atomic_write_bytes(archive_path, orjson.dumps(archive_payload, option=orjson.OPT_INDENT_2))
+    atomic_write_bytes(status_path, orjson.dumps(status_payload, option=orjson.OPT_INDENT_2))
+    atomic_write_bytes(title_cache_path, orjson.dumps({}, option=orjson.OPT_INDENT_2))
 
     print(f"Wrote: {latest_path} ({len(subscription_items)} items)")
     print(f"Wrote: {archive_path} ({len(archive)} items)")
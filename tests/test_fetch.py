@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from scripts import update_news
+from scripts.update_news import create_session, fetch_opml_rss_async, fetch_rss_feed, iso
+
+FEED = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss><channel><title>Feed</title>
+<item><title>A</title><link>https://x/a</link><pubDate>2026-02-20T00:00:00Z</pubDate></item>
+</channel></rss>"""
+ETAG = '"v1"'
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        FeedHandler.hits += 1
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+
+class ConditionalFetchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.feed_url = f"http://127.0.0.1:{cls.server.server_port}/feed.xml"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.now = datetime(2026, 2, 21, tzinfo=timezone.utc)
+
+    def test_fetch_rss_feed_not_modified(self):
+        session = create_session()
+        items, status, content = fetch_rss_feed(session, self.now, self.feed_url, "s", "S", "Feed")
+        self.assertEqual(len(items), 1)
+        self.assertEqual(status["etag"], ETAG)
+        self.assertEqual(content, FEED)
+
+        validators = {"etag": status["etag"]}
+        items, status, content = fetch_rss_feed(
+            session, self.now, self.feed_url, "s", "S", "Feed", validators=validators
+        )
+        self.assertEqual(items, [])
+        self.assertIsNone(content)
+        self.assertTrue(status["ok"])
+        self.assertTrue(status["unchanged"])
+        self.assertEqual(status["etag"], ETAG)
+
+    def test_fetch_opml_not_modified(self):
+        opml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0"><body><outline text="Feed" xmlUrl="{self.feed_url}" /></body></opml>"""
+        with TemporaryDirectory() as td:
+            p = Path(td) / "x.opml"
+            p.write_text(opml, encoding="utf-8")
+            items, summary, feeds = asyncio.run(fetch_opml_rss_async(self.now, p))
+            self.assertEqual(len(items), 1)
+            self.assertFalse(summary["unchanged"])
+
+            validators = {self.feed_url: {"etag": feeds[0]["etag"]}}
+            items, summary, feeds = asyncio.run(fetch_opml_rss_async(self.now, p, validators=validators))
+        self.assertEqual(items, [])
+        self.assertTrue(feeds[0]["unchanged"])
+        self.assertEqual(feeds[0]["etag"], ETAG)
+        self.assertTrue(summary["unchanged"])
+        self.assertEqual(summary["item_count"], 0)
+
+    def test_main_not_modified_still_prunes_stale_records(self):
+        now = datetime.now(timezone.utc)
+
+        def record(item_id, title, last_seen):
+            return {
+                "id": item_id,
+                "site_id": "opmlrss",
+                "site_name": "OPML RSS",
+                "source": "Feed",
+                "title": title,
+                "url": f"https://x/{item_id}",
+                "subscription_url": self.feed_url,
+                "first_seen_at": iso(last_seen),
+                "last_seen_at": iso(last_seen),
+            }
+
+        archive = {
+            "items": [
+                record("fresh", "Still in the feed", now - timedelta(days=1)),
+                record("stale", "Dropped from the feed", now - timedelta(days=10)),
+            ]
+        }
+        status = {"sites": [], "rss_opml": {"feeds": [{"feed_url": self.feed_url, "ok": True, "etag": ETAG}]}}
+        opml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0"><body><outline text="Feed" xmlUrl="{self.feed_url}" /></body></opml>"""
+        with TemporaryDirectory() as td:
+            out = Path(td)
+            (out / "archive.json").write_text(json.dumps(archive), encoding="utf-8")
+            (out / "source-status.json").write_text(json.dumps(status), encoding="utf-8")
+            opml_path = out / "x.opml"
+            opml_path.write_text(opml, encoding="utf-8")
+            argv = ["update_news.py", "--output-dir", td, "--rss-opml", str(opml_path), "--archive-days", "7"]
+            momoyu_url = self.feed_url.replace("feed.xml", "momoyu.xml")
+            with mock.patch("sys.argv", argv), mock.patch.object(update_news, "MOMOYU_RSS_URL", momoyu_url):
+                with redirect_stdout(StringIO()):
+                    self.assertEqual(update_news.main(), 0)
+            ids = {it["id"] for it in json.loads((out / "archive.json").read_text(encoding="utf-8"))["items"]}
+        self.assertIn("fresh", ids)
+        self.assertNotIn("stale", ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
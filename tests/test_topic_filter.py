@@ -5,6 +5,7 @@ from scripts.update_news import (
     maybe_fix_mojibake,
     normalize_source_for_display,
     parse_feed_entries_via_xml,
+    parse_feed_via_xml,
 )
 
 
@@ -26,6 +27,51 @@ class TopicFilterTests(unittest.TestCase):
         self.assertEqual(len(items), 1)
         self.assertEqual(items[0]["title"], "A")
 
+    def test_parse_feed_entries_resolves_internal_entities(self):
+        xml = b"""<?xml version='1.0' encoding='UTF-8'?>
+<!DOCTYPE rss [<!ENTITY nbsp "&#160;">]>
+<rss><channel>
+<item><title>Hello&nbsp;World &amp; more</title><link>https://x/a</link></item>
+</channel></rss>"""
+        items = parse_feed_entries_via_xml(xml)
+        self.assertEqual(items[0]["title"], "Hello\xa0World & more")
+
+    def test_parse_feed_entries_repairs_malformed_references(self):
+        xml = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss><channel>
+<item><title>Hello&nbsp;World &mdash; x</title><link>https://x/a?a=1&b=2</link></item>
+<item><title>A & B &bogus;</title><link>https://x/b</link></item>
+<item><title><![CDATA[C &amp; D]]></title><link>https://x/c</link></item>
+</channel></rss>"""
+        items = parse_feed_entries_via_xml(xml)
+        self.assertEqual(
+            [(it["title"], it["link"]) for it in items],
+            [
+                ("Hello\xa0World — x", "https://x/a?a=1&b=2"),
+                ("A & B &bogus;", "https://x/b"),
+                ("C &amp; D", "https://x/c"),
+            ],
+        )
+
+    def test_parse_feed_entries_prefers_plain_title(self):
+        xml = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss xmlns:media="http://search.yahoo.com/mrss/"><channel>
+<item><media:title>Media T</media:title><title>Real</title><link>https://x/a</link></item>
+<item><media:title>Only Media</media:title><link>https://x/b</link></item>
+</channel></rss>"""
+        items = parse_feed_entries_via_xml(xml)
+        self.assertEqual([it["title"] for it in items], ["Real", "Only Media"])
+
+    def test_parse_feed_via_xml_atom(self):
+        xml = b"""<?xml version='1.0' encoding='UTF-8'?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+<entry><title>B</title><link rel="replies" href="https://x/b#comments"/>
+<link rel="alternate" href="https://x/b"/><updated>2026-02-20T00:00:00Z</updated></entry>
+</feed>"""
+        feed_title, items = parse_feed_via_xml(xml)
+        self.assertEqual(feed_title, "Blog")
+        self.assertEqual(items, [{"title": "B", "link": "https://x/b", "published": "2026-02-20T00:00:00Z"}])
+
     def test_group_stats(self):
         items = [
             {
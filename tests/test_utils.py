@@ -1,9 +1,18 @@
+import json
 import unittest
 from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from scripts.update_news import make_item_id, normalize_url, parse_date_any, parse_opml_subscriptions
+from scripts.update_news import (
+    conditional_headers,
+    load_archive,
+    load_feed_validators,
+    make_item_id,
+    normalize_url,
+    parse_date_any,
+    parse_opml_subscriptions,
+)
 
 
 class UtilsTests(unittest.TestCase):
@@ -11,16 +20,75 @@ class UtilsTests(unittest.TestCase):
         raw = "https://example.com/path?a=1&utm_source=x&fbclid=abc"
         self.assertEqual(normalize_url(raw), "https://example.com/path?a=1")
 
+    def test_normalize_url_keeps_clean_query(self):
+        raw = "HTTPS://Example.com/path?id=1&page=2#top"
+        self.assertEqual(normalize_url(raw), "https://example.com/path?id=1&page=2")
+        self.assertEqual(normalize_url("https://example.com/p?ref&x=a b"), "https://example.com/p?x=a+b")
+
     def test_make_item_id_stable(self):
         a = make_item_id("site", "src", "Title", "https://a.com?p=1&utm_source=x")
         b = make_item_id("site", "src", "Title", "https://a.com?p=1")
         self.assertEqual(a, b)
 
+    def test_load_archive_migrates_legacy_ids(self):
+        record = {
+            "id": "881b127ef79d946ac36993ef6001cbebfc744b47",
+            "site_id": "opmlrss",
+            "source": "FeedA",
+            "title": "Title",
+            "url": "https://a.com/p",
+        }
+        with TemporaryDirectory() as td:
+            p = Path(td) / "archive.json"
+            p.write_text(json.dumps({"items": [record]}), encoding="utf-8")
+            archive = load_archive(p)
+        item_id = make_item_id("opmlrss", "FeedA", "Title", "https://a.com/p")
+        self.assertEqual(list(archive), [item_id])
+        self.assertEqual(archive[item_id]["id"], item_id)
+
+    def test_feed_validators_round_trip(self):
+        status = {
+            "sites": [{"site_id": "momoyurss", "ok": True, "feed_url": "https://m/rss", "etag": '"abc"'}],
+            "rss_opml": {
+                "feeds": [
+                    {"ok": True, "feed_url": "https://a/rss", "last_modified": "Tue, 07 Oct 2025 03:00:00 GMT"},
+                    {"ok": False, "feed_url": "https://b/rss", "etag": '"old"'},
+                ]
+            },
+        }
+        with TemporaryDirectory() as td:
+            p = Path(td) / "source-status.json"
+            p.write_text(json.dumps(status), encoding="utf-8")
+            validators = load_feed_validators(p)
+        self.assertEqual(set(validators), {"https://m/rss", "https://a/rss"})
+        self.assertEqual(conditional_headers(validators["https://m/rss"]), {"If-None-Match": '"abc"'})
+        self.assertEqual(
+            conditional_headers(validators["https://a/rss"]),
+            {"If-Modified-Since": "Tue, 07 Oct 2025 03:00:00 GMT"},
+        )
+
     def test_parse_date_any_english_rfc_not_misparsed_as_today(self):
         now = datetime(2026, 2, 21, 4, 30, tzinfo=timezone.utc)
         dt = parse_date_any("Tue, 07 Oct 2025 03:00:00 GMT", now)
         self.assertEqual(dt, datetime(2025, 10, 7, 3, 0, tzinfo=timezone.utc))
 
+    def test_parse_date_any_iso_and_rfc_zones(self):
+        now = datetime(2026, 2, 21, 4, 30, tzinfo=timezone.utc)
+        self.assertEqual(
+            parse_date_any("2026-02-20T10:00:00+08:00", now),
+            datetime(2026, 2, 20, 2, 0, tzinfo=timezone.utc),
+        )
+        # Ambiguous zone names (CST is usually China Standard Time here) are not US-shifted.
+        self.assertEqual(
+            parse_date_any("Tue, 07 Oct 2025 03:00:00 CST", now),
+            datetime(2025, 10, 7, 3, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            parse_date_any("Tue, 07 Oct 2025 03:00:00 +0800", now),
+            datetime(2025, 10, 6, 19, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(parse_date_any("2026/02/20 10:00", now), datetime(2026, 2, 20, 10, 0, tzinfo=timezone.utc))
+
     def test_parse_opml_subscriptions(self):
         opml = """<?xml version="1.0" encoding="UTF-8"?>
 <opml version="2.0"><body>